@@ -1,20 +1,290 @@
 import os
 import sys
+import hashlib
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.dataset as ds
+from numba import njit, prange
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QPushButton, QLabel, QFileDialog, QMessageBox, QComboBox, QLineEdit,
     QTextEdit, QScrollArea, QFrame, QInputDialog
 )
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QObject, QRunnable, QThreadPool, pyqtSignal
 from datetime import datetime
 
-# 配置Matplotlib以在GUI中显示图形 
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
+# pandas 2.x 需显式开启写时复制, 3.0 起已默认开启
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option('mode.copy_on_write', True)
+
+# seaborn 导入较慢, 首次绘图时再加载
+sns = None
+
+# 低基数字符串列转换为 category 的唯一值阈值
+CATEGORICAL_CARDINALITY_THRESHOLD = 32
+
+# 超过该大小的 CSV 分块读取, 以降低解析时的峰值内存
+LARGE_CSV_BYTES = 512 * 1024 * 1024
+CSV_BLOCK_BYTES = 64 * 1024 * 1024
+
+# 已解析数据的 Parquet 缓存目录
+CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'DataAnalysisTool')
+# 读取逻辑变化时递增, 使旧缓存失效
+CACHE_FORMAT_VERSION = 3
+
+
+@njit(nogil=True, cache=True)
+def _zscore_column(x, thresh, out):
+    """单列 z-score 掩码写入 out (忽略 NaN); 两遍计算均值与离差平方和, 避免大偏移数据丢失精度"""
+    n = x.shape[0]
+    count = 0
+    total = 0.0
+    for i in range(n):
+        v = x[i]
+        if not np.isnan(v):
+            count += 1
+            total += v
+    if count < 2:
+        for i in range(n):
+            out[i] = False
+        return
+
+    mu = total / count
+    m2 = 0.0
+    for i in range(n):
+        v = x[i]
+        if not np.isnan(v):
+            m2 += (v - mu) * (v - mu)
+
+    # 与 pandas 的 std() 一致, 使用样本标准差 (ddof=1)
+    sigma = np.sqrt(m2 / (count - 1))
+    limit = thresh * sigma
+    for i in range(n):
+        out[i] = abs(x[i] - mu) > limit
+
+
+@njit(nogil=True, cache=True)
+def zscore_outliers(x, thresh):
+    """返回 |z| > thresh 的布尔掩码 (忽略 NaN)"""
+    mask = np.empty(x.shape[0], dtype=np.bool_)
+    _zscore_column(x, thresh, mask)
+    return mask
+
+
+@njit(parallel=True, nogil=True, cache=True)
+def zscore_all(mat, thresh, out_mask):
+    """按列并行计算 z-score 掩码, mat 为 (n, k) 的列优先数组 (忽略 NaN)"""
+    k = mat.shape[1]
+    for j in prange(k):
+        _zscore_column(mat[:, j], thresh, out_mask[:, j])
+    return out_mask
+
+
+def _widen_type(pa_type):
+    """列类型冲突时的放宽顺序: null → int64 → float64 → string"""
+    if pa.types.is_null(pa_type):
+        return pa.int64()
+    if pa.types.is_integer(pa_type):
+        return pa.float64()
+    return pa.string()
+
+
+def _parse_column(raw, pa_type):
+    """把按字符串读入的列解析为目标类型"""
+    if pa.types.is_null(pa_type):
+        if raw.null_count != len(raw):
+            raise pa.ArrowInvalid("non-null value in an all-null column")
+        return pa.nulls(len(raw))
+    if pa.types.is_time(pa_type):
+        # Arrow 不支持字符串直接转时间类型, 经 timestamp 中转
+        return pc.strptime(raw, format='%H:%M:%S', unit='s').cast(pa_type)
+    return raw.cast(pa_type)
+
+
+def read_large_csv(file_path):
+    """流式分块读取大 CSV; 以首块推断的类型为起点, 遇到冲突的列逐级放宽, 只读一遍文件"""
+    read_options = pacsv.ReadOptions(block_size=CSV_BLOCK_BYTES)
+    # 打开时只解析首块, 用于推断各列类型
+    probe = pacsv.open_csv(file_path, read_options=read_options)
+    schema = probe.schema
+    probe.close()
+
+    names = schema.names
+    types = list(schema.types)
+    reader = pacsv.open_csv(
+        file_path,
+        read_options=read_options,
+        convert_options=pacsv.ConvertOptions(
+            column_types={name: pa.string() for name in names},
+            strings_can_be_null=True
+        )
+    )
+    chunks = [[] for _ in names]
+    for batch in reader:
+        for i in range(len(names)):
+            raw = batch.column(i)
+            while True:
+                try:
+                    parsed = _parse_column(raw, types[i])
+                    break
+                except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+                    # 放宽该列类型, 已解析的块同步转换
+                    types[i] = _widen_type(types[i])
+                    chunks[i] = [chunk.cast(types[i]) for chunk in chunks[i]]
+            chunks[i].append(parsed)
+
+    table = pa.Table.from_arrays(
+        [pa.chunked_array(chunks[i], type=types[i]) for i in range(len(names))],
+        names=names
+    )
+    return table.to_pandas(types_mapper=pd.ArrowDtype)
+
+
+def _cache_path(src):
+    """源文件对应的 Parquet 缓存路径: 文件名含路径摘要与版本 (缓存格式、修改时间、大小) 摘要"""
+    stat = os.stat(src)
+    path_digest = hashlib.sha1(os.path.abspath(src).encode('utf-8')).hexdigest()[:12]
+    version = f"{CACHE_FORMAT_VERSION}|{stat.st_mtime_ns}|{stat.st_size}"
+    version_digest = hashlib.sha1(version.encode('utf-8')).hexdigest()[:12]
+    name = f"{os.path.basename(src)}-{path_digest}-{version_digest}.parquet"
+    return os.path.join(CACHE_DIR, name)
+
+
+def _evict_stale_cache(cache_path):
+    """删除同一源文件旧版本的缓存"""
+    keep = os.path.basename(cache_path)
+    prefix = keep.rsplit('-', 1)[0] + '-'
+    for name in os.listdir(CACHE_DIR):
+        if name.startswith(prefix) and name.endswith('.parquet') and name != keep:
+            os.remove(os.path.join(CACHE_DIR, name))
+
+
+def write_parquet_cache(data, cache_path):
+    """写入 Parquet 缓存; 缓存失败不影响正常使用"""
+    tmp_path = cache_path + '.tmp'
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        data.to_parquet(tmp_path, compression='zstd', engine='pyarrow', index=False)
+        os.replace(tmp_path, cache_path)
+        _evict_stale_cache(cache_path)
+    except (OSError, pa.ArrowException) as e:
+        print(f"Failed to write cache: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def read_folder(folder):
+    """用 Arrow 数据集多线程读取目录下的 Parquet 或 CSV 分片"""
+    names = sorted(os.listdir(folder))
+    for fmt in ('parquet', 'csv'):
+        paths = [os.path.join(folder, name) for name in names if name.endswith('.' + fmt)]
+        if paths:
+            break
+    else:
+        raise ValueError("No CSV or Parquet files found in folder")
+
+    table = ds.dataset(paths, format=fmt).to_table(use_threads=True)
+    return table.to_pandas(types_mapper=pd.ArrowDtype)
+
+
+def _arrow_csv_compatible(pa_type):
+    """该 Arrow 类型写出的 CSV 文本是否与 to_csv 一致 (字符串、数值、布尔及字符串字典)"""
+    if pa.types.is_dictionary(pa_type):
+        pa_type = pa_type.value_type
+    return (pa.types.is_string(pa_type) or pa.types.is_large_string(pa_type)
+            or pa.types.is_integer(pa_type) or pa.types.is_floating(pa_type)
+            or pa.types.is_boolean(pa_type) or pa.types.is_null(pa_type))
+
+
+def infer_field_types(data, downcast=True):
+    """识别字段类型, 返回 (字段类型, 需替换的列); 不修改传入的数据"""
+    field_types = {}
+    converted = {}
+    for column in data.columns:
+        dtype = data[column].dtype
+        if isinstance(dtype, pd.CategoricalDtype):
+            field_types[column] = 'categorical'
+            continue
+        if not isinstance(dtype, pd.ArrowDtype):
+            # 嵌套或混合类型的字段 (如 JSON) 转换后仍为 object, 按字符串处理
+            if pd.api.types.is_object_dtype(dtype):
+                field_types[column] = 'string'
+            continue
+        pa_type = dtype.pyarrow_dtype
+        if pa.types.is_string(pa_type) or pa.types.is_large_string(pa_type):
+            unique_values = data[column].nunique(dropna=True)
+            if unique_values <= max(CATEGORICAL_CARDINALITY_THRESHOLD, 0.5 * len(data)):
+                # 低基数列使用字典编码, 后续分组/计数基于整数编码
+                converted[column] = data[column].astype('category')
+                field_types[column] = 'categorical'
+            else:
+                field_types[column] = 'string'
+        elif pa.types.is_integer(pa_type):
+            field_types[column] = 'numeric'
+            # 含缺失值的列之后会被填充, 保留原位宽以容纳任意填充值
+            if downcast and not data[column].hasnans:
+                converted[column] = pd.to_numeric(data[column], downcast='integer')
+        elif pa.types.is_floating(pa_type):
+            field_types[column] = 'numeric'
+            if downcast and not data[column].hasnans:
+                narrowed = pd.to_numeric(data[column], downcast='float')
+                # 仅在 float32 可无损表示时降低精度
+                if narrowed.astype(dtype).equals(data[column]):
+                    converted[column] = narrowed
+        elif pa.types.is_timestamp(pa_type) or pa.types.is_date(pa_type):
+            field_types[column] = 'datetime'
+        elif pa.types.is_boolean(pa_type):
+            field_types[column] = 'boolean'
+
+    return field_types, converted
+
+
+def describe_numeric(arr, columns):
+    """在二维 float64 数组上计算与 describe() 相同的统计量"""
+    count = np.sum(~np.isnan(arr), axis=0)
+    stats = np.full((8, arr.shape[1]), np.nan)
+    stats[0] = count
+    # 与 describe() 一致: 无有效值的列统计量为 NaN, 少于两个值时 std 为 NaN; 避免 NumPy 告警
+    has_values = count > 0
+    if has_values.any():
+        sub = arr[:, has_values]
+        stats[1, has_values] = np.nanmean(sub, axis=0)
+        stats[3:, has_values] = np.nanpercentile(sub, [0, 25, 50, 75, 100], axis=0)
+    has_spread = count > 1
+    if has_spread.any():
+        stats[2, has_spread] = np.nanstd(arr[:, has_spread], axis=0, ddof=1)
+    return pd.DataFrame(
+        stats, columns=columns,
+        index=['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max']
+    )
+
+
+class ComputeSignals(QObject):
+    """后台任务向主线程回传结果的信号"""
+    finished = pyqtSignal(object)
+    error = pyqtSignal(str)
+
+
+class ComputeTask(QRunnable):
+    """在线程池中执行耗时计算"""
+    def __init__(self, fn, *args):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.signals = ComputeSignals()
+        # 由 Python 端持有, 避免回调前被 Qt 提前释放
+        self.setAutoDelete(False)
+
+    def run(self):
+        try:
+            result = self.fn(*self.args)
+        except Exception as e:
+            self.signals.error.emit(str(e))
+        else:
+            self.signals.finished.emit(result)
 
 
 class DataAnalysisTool(QMainWindow):
@@ -24,6 +294,15 @@ class DataAnalysisTool(QMainWindow):
         self.setGeometry(100, 100, 1200, 800)
         self.data = None
         self.current_plot = None
+        # 是否在类型识别后压缩数值列位宽
+        self.downcast = True
+        # 正在运行的后台任务
+        self._tasks = set()
+        # 不影响界面交互的后台任务 (如写缓存)
+        self._background_tasks = set()
+        # 数值列与类别列名缓存, 数据变化时刷新
+        self._numeric_cols = []
+        self._cat_cols = []
 
         # 创建主布局 
         main_widget = QWidget()
@@ -36,6 +315,10 @@ class DataAnalysisTool(QMainWindow):
         self.load_button.clicked.connect(self.load_data)
         button_layout.addWidget(self.load_button)
 
+        self.load_folder_button = QPushButton("Load Folder")
+        self.load_folder_button.clicked.connect(self.load_folder)
+        button_layout.addWidget(self.load_folder_button)
+
         self.clean_button = QPushButton("Clean Data")
         self.clean_button.clicked.connect(self.clean_data)
         button_layout.addWidget(self.clean_button)
@@ -65,10 +348,50 @@ class DataAnalysisTool(QMainWindow):
 
         main_layout.addWidget(preview_frame)
 
-        # 添加图表显示区域 
-        self.figure = Figure(figsize=(8, 6))
-        self.canvas = FigureCanvas(self.figure)
-        main_layout.addWidget(self.canvas)
+        # 添加图表显示区域 (画布在首次绘图时创建)
+        plot_frame = QFrame()
+        self.plot_layout = QVBoxLayout(plot_frame)
+        main_layout.addWidget(plot_frame)
+        self.figure = self.canvas = None
+
+    def _run_task(self, fn, *args, on_done=None):
+        """将耗时计算提交到线程池, 结果通过信号回到主线程"""
+        task = ComputeTask(fn, *args)
+        self._tasks.add(task)
+        if on_done is not None:
+            task.signals.finished.connect(on_done)
+        task.signals.finished.connect(lambda _: self._finish_task(task))
+        task.signals.error.connect(lambda message: self._finish_task(task, message))
+
+        # 计算期间禁用操作按钮, 避免并发修改数据
+        self._set_buttons_enabled(False)
+        QThreadPool.globalInstance().start(task)
+
+    def _run_background(self, fn, *args):
+        """提交后台任务, 不禁用按钮; 仅保留引用直到任务结束"""
+        task = ComputeTask(fn, *args)
+        self._background_tasks.add(task)
+        task.signals.finished.connect(lambda _: self._background_tasks.discard(task))
+        task.signals.error.connect(lambda _: self._background_tasks.discard(task))
+        QThreadPool.globalInstance().start(task)
+
+    def _finish_task(self, task, error=None):
+        """后台任务结束后恢复界面"""
+        self._tasks.discard(task)
+        if not self._tasks:
+            self._set_buttons_enabled(True)
+        if error is not None:
+            QMessageBox.critical(self, "Error", f"Computation failed: {error}")
+
+    def _set_buttons_enabled(self, enabled):
+        for button in (self.load_button, self.load_folder_button, self.clean_button,
+                       self.analyze_button, self.export_button):
+            button.setEnabled(enabled)
+
+    def _refresh_column_index(self):
+        """重新缓存数值列与类别列名"""
+        self._numeric_cols = self.data.select_dtypes(include='number').columns.tolist()
+        self._cat_cols = self.data.select_dtypes(include='category').columns.tolist()
 
     def load_data(self):
         """加载数据文件"""
@@ -79,41 +402,82 @@ class DataAnalysisTool(QMainWindow):
         if not file_path:
             return
 
+        # 扩展名不区分大小写; 不支持的类型在读取和写缓存之前直接拒绝
+        ext = os.path.splitext(file_path)[1].lower()
+        if ext not in ('.csv', '.xlsx', '.json'):
+            QMessageBox.critical(self, "Error", f"Unsupported file type: {ext or file_path}")
+            return
+
         try:
-            if file_path.endswith('.csv'):
-                self.data = pd.read_csv(file_path)
-            elif file_path.endswith('.xlsx'):
-                self.data = pd.read_excel(file_path)
-            elif file_path.endswith('.json'):
-                self.data = pd.read_json(file_path)
+            cache_path = _cache_path(file_path)
+            if os.path.exists(cache_path):
+                # 命中缓存, 以内存映射方式读取
+                data = pd.read_parquet(
+                    cache_path, engine='pyarrow', dtype_backend='pyarrow', memory_map=True
+                )
+            else:
+                if ext == '.csv':
+                    if os.path.getsize(file_path) > LARGE_CSV_BYTES:
+                        data = read_large_csv(file_path)
+                    else:
+                        data = pd.read_csv(file_path, engine='pyarrow', dtype_backend='pyarrow')
+                elif ext == '.xlsx':
+                    data = pd.read_excel(file_path, dtype_backend='pyarrow')
+                else:
+                    data = pd.read_json(file_path, dtype_backend='pyarrow')
 
-                # 更新数据预览
-            self.preview_text.setPlainText(str(self.data.head(10)))
+                # 统一为 Arrow 列式类型
+                data = data.convert_dtypes(dtype_backend='pyarrow')
 
-            # 更新字段类型识别 
-            self.identify_field_types()
+                # 后台写入缓存, 下次加载同一文件时直接读取
+                self._run_background(write_parquet_cache, data.copy(deep=False), cache_path)
+
+            # 解析成功后才替换当前数据
+            self.data = data
+            self._refresh_column_index()
+            self._show_loaded_data()
 
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to load data: {str(e)}")
 
+    def load_folder(self):
+        """加载目录中的多个数据分片"""
+        folder = QFileDialog.getExistingDirectory(self, "Load Folder")
+        if not folder:
+            return
+
+        self._run_task(read_folder, folder, on_done=self._set_folder_data)
+
+    def _set_folder_data(self, data):
+        """在主线程中接收目录读取结果"""
+        self.data = data
+        self._refresh_column_index()
+        self._show_loaded_data()
+
+    def _show_loaded_data(self):
+        """更新数据预览并识别字段类型"""
+        # 更新数据预览
+        self.preview_text.setHtml(self.data.head(10).to_html(max_cols=12))
+
+        # 更新字段类型识别
+        self.identify_field_types()
+
     def identify_field_types(self):
         """自动识别字段类型"""
         if self.data is None:
             return
 
-        field_types = {}
-        for column in self.data.columns:
-            dtype = self.data[column].dtype
-            if dtype == 'object':
-                unique_values = self.data[column].nunique()
-                if unique_values <= 10:
-                    field_types[column] = 'categorical'
-                else:
-                    field_types[column] = 'string'
-            elif dtype in ['int64', 'float64']:
-                field_types[column] = 'numeric'
-            elif dtype == 'datetime64[ns]':
-                field_types[column] = 'datetime'
+        self._run_task(
+            infer_field_types, self.data, self.downcast,
+            on_done=self._apply_field_types
+        )
+
+    def _apply_field_types(self, result):
+        """在主线程中写回类型转换结果"""
+        field_types, converted = result
+        for column, series in converted.items():
+            self.data[column] = series
+        self._refresh_column_index()
 
         print("Field Types:")
         print(field_types)
@@ -123,14 +487,18 @@ class DataAnalysisTool(QMainWindow):
         if self.data is None:
             return
 
+        try:
             # 处理缺失值
-        self.handle_missing_values()
+            self.handle_missing_values()
 
-        # 删除重复值 
-        self.remove_duplicates()
+            # 删除重复值
+            self.remove_duplicates()
 
-        # 检测异常值 
-        self.detect_outliers()
+            # 检测异常值
+            self.detect_outliers()
+
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to clean data: {str(e)}")
 
     def handle_missing_values(self):
         """处理缺失值"""
@@ -144,21 +512,48 @@ class DataAnalysisTool(QMainWindow):
                     self, 'Custom Fill Value', 'Enter Fill Value:'
                 )
                 if ok:
-                    for col in self.data.columns:
-                        if self.data[col].dtype in ['int64', 'float64']:
-                            self.data[col].fillna(float(fill_value), inplace=True)
-                        else:
-                            self.data[col].fillna(str(fill_value), inplace=True)
+                    # 字符串/类别列填入文本; 数值列仅在输入可转为数字时填充;
+                    # 日期、布尔等其他 Arrow 类型无法容纳任意文本, 不做填充
+                    fill_map = {
+                        col: str(fill_value) for col in self.data.columns
+                        if col in self._cat_cols or pd.api.types.is_string_dtype(self.data[col])
+                    }
+                    try:
+                        number = float(fill_value)
+                    except ValueError:
+                        number = None
+                    if number is not None:
+                        fill_map.update({col: number for col in self._numeric_cols})
+                    # category 列需先注册新类别才能填充
+                    for col in self._cat_cols:
+                        if self.data[col].hasnans and fill_map[col] not in self.data[col].cat.categories:
+                            self.data[col] = self.data[col].cat.add_categories([fill_map[col]])
+                    self._widen_for_fill(fill_map)
+                    self.data.fillna(value=fill_map, inplace=True)
+                    self._refresh_column_index()
             else:
-                for col in self.data.columns:
-                    if self.data[col].dtype in ['int64', 'float64']:
-                        if method == 'mean':
-                            self.data[col].fillna(self.data[col].mean(), inplace=True)
-                        elif method == 'median':
-                            self.data[col].fillna(self.data[col].median(), inplace=True)
-                        elif method == 'mode':
-                            mode_val = self.data[col].mode().iloc[0]
-                            self.data[col].fillna(mode_val, inplace=True)
+                num_cols = self._numeric_cols
+                if len(num_cols) == 0:
+                    return
+                if method == 'mode':
+                    modes = self.data[num_cols].mode()
+                    # 全为缺失值的列没有众数, 不做填充
+                    fill_map = {} if modes.empty else {
+                        col: value for col, value in modes.iloc[0].items() if pd.notna(value)
+                    }
+                else:
+                    fill_map = getattr(self.data[num_cols], method)().to_dict()
+                self._widen_for_fill(fill_map)
+                self.data.fillna(value=fill_map, inplace=True)
+                self._refresh_column_index()
+
+    def _widen_for_fill(self, fill_map):
+        """含缺失值的整数列遇到非整数填充值时先转为 float64, 避免被截断"""
+        for col, value in fill_map.items():
+            dtype = self.data[col].dtype
+            if (isinstance(dtype, pd.ArrowDtype) and pa.types.is_integer(dtype.pyarrow_dtype)
+                    and self.data[col].hasnans and not float(value).is_integer()):
+                self.data[col] = self.data[col].astype('float64[pyarrow]')
 
     def remove_duplicates(self):
         """删除重复值"""
@@ -167,26 +562,57 @@ class DataAnalysisTool(QMainWindow):
             self, 'Remove Duplicates', 'Select Strategy:', strategy, 0, False
         )
         if ok:
-            if strat == 'all':
-                self.data.drop_duplicates(inplace=True)
-            else:
-                self.data.drop_duplicates(keep=strat, inplace=True)
+            # 可仅按关键列判重, 避免对所有列 (尤其长字符串列) 做哈希
+            all_columns = 'All Columns'
+            columns = [all_columns] + self.data.columns.tolist()
+            key, ok = QInputDialog.getItem(
+                self, 'Remove Duplicates', 'Select Key Column:', columns, 0, False
+            )
+            if ok:
+                chosen = None if key == all_columns else [key]
+                self.data = self.data.drop_duplicates(
+                    subset=chosen,
+                    keep=strat if strat != 'all' else 'first',
+                    ignore_index=True
+                )
+                self._refresh_column_index()
 
     def detect_outliers(self):
         """检测异常值"""
-        columns = self.data.select_dtypes(include=['int64', 'float64']).columns.tolist()
+        all_columns = 'All Numeric Columns'
+        columns = [all_columns] + self._numeric_cols
         column, ok = QInputDialog.getItem(
             self, 'Detect Outliers', 'Select Column:', columns, 0, False
         )
         if ok:
-            z_scores = (self.data[column] - self.data[column].mean()) / self.data[column].std()
             threshold, ok = QInputDialog.getDouble(
                 self, 'Outlier Threshold', 'Enter Z-Score Threshold:', 3.0
             )
             if ok:
-                outliers = self.data[np.abs(z_scores) > threshold]
-                print("Detected Outliers:")
-                print(outliers)
+                data = self.data
+                if column == all_columns:
+                    # 每列一个线程, 任一列超出阈值的行视为异常
+                    mat = np.asfortranarray(
+                        data[self._numeric_cols].to_numpy(dtype=np.float64, na_value=np.nan)
+                    )
+                    out_mask = np.empty(mat.shape, dtype=np.bool_, order='F')
+                    self._run_task(
+                        zscore_all, mat, threshold, out_mask,
+                        on_done=lambda mask: self._show_outliers(data.iloc[mask.any(axis=1)])
+                    )
+                else:
+                    arr = np.ascontiguousarray(
+                        data[column].to_numpy(dtype=np.float64, na_value=np.nan)
+                    )
+                    self._run_task(
+                        zscore_outliers, arr, threshold,
+                        on_done=lambda mask: self._show_outliers(data.iloc[mask])
+                    )
+
+    def _show_outliers(self, outliers):
+        """输出异常值"""
+        print("Detected Outliers:")
+        print(outliers)
 
     def analyze_data(self):
         """数据分析与可视化"""
@@ -201,12 +627,42 @@ class DataAnalysisTool(QMainWindow):
 
     def perform_statistical_analysis(self):
         """统计分析"""
-        stats = self.data.describe()
+        num = self.data[self._numeric_cols]
+        if num.shape[1] == 0:
+            self._run_task(self.data.describe, on_done=self._show_statistics)
+            return
+
+        # 先取出连续的二维数组, 后台仅做 NumPy 归约
+        arr = np.ascontiguousarray(num.to_numpy(dtype=np.float64, na_value=np.nan))
+        self._run_task(
+            describe_numeric, arr, num.columns.tolist(),
+            on_done=self._show_statistics
+        )
+
+    def _show_statistics(self, stats):
+        """输出统计结果"""
         print("Basic Statistics:")
         print(stats)
 
+    def _ensure_canvas(self):
+        """按需加载 Matplotlib/seaborn 并创建画布"""
+        global sns
+        if self.canvas is not None:
+            return
+
+        # 配置Matplotlib以在GUI中显示图形
+        from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+        from matplotlib.figure import Figure
+        import seaborn as sns
+
+        self.figure = Figure(figsize=(8, 6))
+        self.canvas = FigureCanvas(self.figure)
+        self.plot_layout.addWidget(self.canvas)
+
     def visualize_data(self):
         """数据可视化"""
+        self._ensure_canvas()
+
         chart_types = ['bar', 'line', 'pie', 'scatter', 'heatmap']
         chart_type, ok = QInputDialog.getItem(
             self, 'Chart Type', 'Select Chart Type:', chart_types, 0, False
@@ -220,27 +676,68 @@ class DataAnalysisTool(QMainWindow):
                 self, 'Y Axis', 'Select Y Column:', columns, 0, False
             )
 
+            if chart_type == 'heatmap' and not self._numeric_cols:
+                QMessageBox.warning(self, "Warning", "No numeric columns to correlate.")
+                return
+
+            # 复用嵌入的画布, 不再每次创建新窗口
+            self.figure.clear()
+            ax = self.figure.add_subplot(111)
+
             if chart_type == 'bar':
-                plt.figure(figsize=(10, 6))
-                sns.barplot(x=x_col, y=y_col, data=self.data)
+                sns.barplot(x=x_col, y=y_col, data=self.data, ax=ax)
             elif chart_type == 'line':
-                plt.figure(figsize=(10, 6))
-                sns.lineplot(x=x_col, y=y_col, data=self.data)
+                sns.lineplot(x=x_col, y=y_col, data=self.data, ax=ax)
             elif chart_type == 'pie':
-                plt.figure(figsize=(10, 6))
-                counts = self.data[y_col].value_counts()
-                plt.pie(counts, labels=counts.index, autopct='%1.1f%%')
+                # 基于类别编码做整数计数, 缺失值编码为 -1 需剔除
+                cat = self.data[y_col].astype('category')
+                codes = cat.cat.codes.to_numpy()
+                counts = np.bincount(codes[codes >= 0], minlength=len(cat.cat.categories))
+                labels = cat.cat.categories
+                present = counts > 0
+                ax.pie(counts[present], labels=labels[present], autopct='%1.1f%%')
             elif chart_type == 'scatter':
-                plt.figure(figsize=(10, 6))
-                sns.scatterplot(x=x_col, y=y_col, data=self.data)
+                sns.scatterplot(x=x_col, y=y_col, data=self.data, ax=ax)
             elif chart_type == 'heatmap':
-                plt.figure(figsize=(10, 6))
-                corr = self.data.corr()
-                sns.heatmap(corr, annot=True, cmap='coolwarm')
+                num = self.data[self._numeric_cols]
+                cols = self._numeric_cols
+                arr = num.to_numpy(dtype=np.float64, na_value=np.nan)
+                if np.isnan(arr).any():
+                    # 含缺失值时保留 pandas 的成对剔除语义
+                    corr = num.corr().to_numpy()
+                else:
+                    # 仅一列时 corrcoef 返回 0 维数组, heatmap 需要二维输入
+                    corr = np.atleast_2d(np.corrcoef(arr, rowvar=False))
+                sns.heatmap(
+                    corr, xticklabels=cols, yticklabels=cols,
+                    annot=True, cmap='coolwarm', ax=ax
+                )
+
+            ax.set_title(f"{chart_type.capitalize()}  Plot of {x_col} vs {y_col}")
+            self.figure.tight_layout()
+            self.canvas.draw_idle()
 
-            plt.title(f"{chart_type.capitalize()}  Plot of {x_col} vs {y_col}")
-            plt.tight_layout()
-            plt.show()
+    def _write_csv(self, file_path):
+        """使用 Arrow 的多线程 CSV 写出, 按批次流式写入; Arrow 无法处理时回退到 to_csv"""
+        try:
+            table = pa.Table.from_pandas(self.data, preserve_index=False)
+            if not all(_arrow_csv_compatible(t) for t in table.schema.types):
+                # 时间、时长等类型的文本格式与 to_csv 不同, 交给 pandas 写出
+                self.data.to_csv(file_path, index=False)
+                return
+            with open(file_path, 'wb') as f:
+                # 表头由 pandas 写出, 与 to_csv 一样仅在需要时加引号
+                f.write(self.data.head(0).to_csv(index=False).encode('utf-8'))
+                # 不加引号写出数据; 值中含分隔符、引号或换行时 Arrow 报错并回退
+                pacsv.write_csv(
+                    table, f,
+                    write_options=pacsv.WriteOptions(
+                        include_header=False, quoting_style='none', batch_size=65536
+                    )
+                )
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            # 混合类型的 object 列或需要引号的值
+            self.data.to_csv(file_path, index=False)
 
     def export_data(self):
         """导出数据"""
@@ -255,9 +752,9 @@ class DataAnalysisTool(QMainWindow):
 
         try:
             if file_path.endswith('.csv'):
-                self.data.to_csv(file_path, index=False)
+                self._write_csv(file_path)
             elif file_path.endswith('.xlsx'):
-                self.data.to_excel(file_path, index=False)
+                self.data.to_excel(file_path, index=False, engine='openpyxl')
 
             QMessageBox.information(self, "Success", "Data exported successfully!")
         except Exception as e: